@@ -3,13 +3,14 @@ Stock Portfolio Overview Application
 A Streamlit app for managing and viewing a shared stock portfolio
 """
 
+import functools
 import streamlit as st
 from auth import AuthSystem
 from price_fetcher import PriceFetcher
 from portfolio_dashboard import PortfolioDashboard
 from config import STOCKS
 from translations import get_language, get_text
-from message_system import message_system
+from message_system import get_message_system
 
 # Page configuration
 st.set_page_config(
@@ -20,7 +21,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main-header {
         padding: 1rem 0;
@@ -49,15 +50,43 @@ st.markdown("""
         border-radius: 0.5rem;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+FOOTER_TEMPLATE = """
+<div style='text-align: center; color: #666; font-size: 0.8rem;'>
+📊 {app_name}<br>
+{disclaimer}
+</div>
+"""
+
+@functools.lru_cache(maxsize=None)
+def footer_html(lang: str) -> str:
+    """Footer markup for a language, built once per process"""
+    return FOOTER_TEMPLATE.format(
+        app_name=get_text('portfolio_app', lang),
+        disclaimer=get_text('data_disclaimer', lang)
+    )
+
+@st.cache_resource
+def get_components():
+    """Application components shared by all sessions of this server process"""
+    price_fetcher = PriceFetcher()
+    return AuthSystem(), price_fetcher, PortfolioDashboard(price_fetcher)
+
+def fetch_prices(language: str):
+    """Fetch prices for all configured stocks (closes are cached by cached_latest_closes)"""
+    _, price_fetcher, _ = get_components()
+    return price_fetcher.fetch_stock_prices(STOCKS, language)
 
 def main():
     """Main application function"""
     
+    # Streamlit drops elements that are not re-emitted, so inject the CSS on every run
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+    
     # Initialize components
-    auth = AuthSystem()
-    price_fetcher = PriceFetcher()
-    dashboard = PortfolioDashboard(price_fetcher)
+    auth, price_fetcher, dashboard = get_components()
+    auth.init_session_state()
     
     # Check authentication
     if not auth.is_authenticated():
@@ -84,11 +113,6 @@ def main():
             st.markdown(get_text('portfolio_description', lang))
             st.markdown(get_text('price_info', lang))
         
-        # Fetch stock prices (with caching for better performance)
-        @st.cache_data(ttl=300)  # Cache for 5 minutes
-        def fetch_prices(language):
-            return price_fetcher.fetch_stock_prices(STOCKS, language)
-        
         # Add cache clearing button in sidebar for development
         with st.sidebar:
             if st.button("🔄 Clear Cache & Refresh", use_container_width=True):
@@ -104,24 +128,16 @@ def main():
         user_portfolio_value = total_portfolio_value * user['portfolio_percentage']
         
         # Show user messages (weekend, value changes, one-time messages)
-        message_system.show_messages(user['username'], user_portfolio_value)
+        get_message_system().show_messages(user['username'], user_portfolio_value)
         
         # Display dashboard
-        dashboard.show_dashboard(user, stocks_with_prices, failed_symbols)
+        dashboard.show_dashboard(user, stocks_with_prices, failed_symbols, user_portfolio_value)
         
         # Footer
         st.markdown("---")
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
-            st.markdown(
-                f"""
-                <div style='text-align: center; color: #666; font-size: 0.8rem;'>
-                📊 {get_text('portfolio_app', lang)}<br>
-                {get_text('data_disclaimer', lang)}
-                </div>
-                """, 
-                unsafe_allow_html=True
-            )
+            st.markdown(footer_html(lang), unsafe_allow_html=True)
 
 if __name__ == "__main__":
     main()
@@ -2,13 +2,18 @@
 Authentication system for the portfolio application
 """
 
+import hmac
 import streamlit as st
 from typing import Optional, Dict
-from config import USERS
+from config import USERS_BY_NAME
 from translations import get_language, get_text
 
 class AuthSystem:
-    def __init__(self):
+    def init_session_state(self):
+        """
+        Initialize per-session login state. The AuthSystem instance itself is
+        shared across sessions, so this must run on every script run.
+        """
         if 'authenticated' not in st.session_state:
             st.session_state.authenticated = False
         if 'current_user' not in st.session_state:
@@ -19,11 +24,11 @@ class AuthSystem:
         Authenticate user with username and password
         Returns True if authentication successful, False otherwise
         """
-        for user in USERS:
-            if user['username'] == username and user['password'] == password:
-                st.session_state.authenticated = True
-                st.session_state.current_user = user
-                return True
+        user = USERS_BY_NAME.get(username)
+        if user and hmac.compare_digest(user['password'].encode(), password.encode()):
+            st.session_state.authenticated = True
+            st.session_state.current_user = user
+            return True
         return False
     
     def logout(self):
@@ -2,6 +2,8 @@
 Portfolio configuration data
 """
 
+import numpy as np
+
 USERS = [
     {
         "username": "user",
@@ -41,6 +43,8 @@ USERS = [
     }
 ]
 
+USERS_BY_NAME = {user["username"]: user for user in USERS}
+
 STOCKS = [
     {"symbol": "UQ2B.F", "quantity": 5.4, "price": 365.00, "name": "Index Fund", "industry": "Index"},
     {"symbol": "BP", "quantity": 143.0, "price": 4.41, "name": "BP", "industry": "Oil & Gas"},
@@ -60,3 +64,11 @@ STOCKS = [
     {"symbol": "UAL", "quantity": 50.0, "price": 68.92, "name": "United (Airline)", "industry": "Airlines"},
     {"symbol": "CASH", "quantity": 81358.0, "price": 1.00, "name": "Cash", "industry": None}
 ]
+
+# Column-oriented (structure-of-arrays) views of STOCKS for vectorized math
+STOCK_SYMBOLS = np.array([s["symbol"] for s in STOCKS])
+STOCK_QTY = np.array([s["quantity"] for s in STOCKS], dtype=np.float64)
+STOCK_PRICE = np.array([s["price"] for s in STOCKS], dtype=np.float64)
+
+for _column in (STOCK_SYMBOLS, STOCK_QTY, STOCK_PRICE):
+    _column.setflags(write=False)
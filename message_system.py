@@ -3,80 +3,175 @@ Message system for user notifications and updates
 """
 
 import streamlit as st
-import json
+import functools
+import orjson
 import os
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 import pytz
 from translations import get_language, get_text, format_currency_change
 
+# Minimum time between persisted last-login updates within one session, and
+# the portfolio value move that forces an update before that time is up
+LAST_LOGIN_PERSIST_INTERVAL = 5 * 60  # seconds
+LAST_LOGIN_VALUE_TOLERANCE = 1.0
+
+# NYSE timezone, resolved once at import
+EASTERN_TZ = pytz.timezone('US/Eastern')
+
+@functools.lru_cache(maxsize=64)
+def _parse_login_timestamp(login_iso: str) -> float:
+    """Epoch seconds for an ISO login time (records written before *_ts existed)"""
+    return datetime.fromisoformat(login_iso).timestamp()
+
 class MessageSystem:
     def __init__(self):
         self.messages_file = "user_messages.json"
         self.user_data_file = "user_data.json"
         
+        # Parsed file contents keyed by path: {path: ((mtime_ns, size), data, raw_bytes)}
+        self._cache = {}
+        
         # Initialize files if they don't exist
         self._init_files()
     
     def _init_files(self):
         """Initialize message and user data files if they don't exist"""
-        if not os.path.exists(self.messages_file):
-            with open(self.messages_file, 'w') as f:
-                json.dump({}, f)
+        for path in (self.messages_file, self.user_data_file):
+            # O_EXCL makes check-and-create atomic, so concurrent workers can't
+            # truncate a file another one has just written
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                continue
+            
+            with os.fdopen(fd, 'wb') as f:
+                f.write(orjson.dumps({}))
+    
+    def _read_json(self, path: str, migrate: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """
+        Load a JSON file, reusing the parsed data while the file is unchanged.
+        The returned dict is shared with the cache, so callers that mutate it
+        must write it back with _write_json. If given, migrate is applied
+        in place once per parse.
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return {}
+        
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._cache.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        
+        raw = b""
+        try:
+            with open(path, 'rb') as f:
+                raw = f.read()
+            data = orjson.loads(raw)
+        except:
+            data = {}
+        
+        if migrate is not None:
+            migrate(data)
         
-        if not os.path.exists(self.user_data_file):
-            with open(self.user_data_file, 'w') as f:
-                json.dump({}, f)
+        self._cache[path] = (signature, data, raw)
+        return data
     
-    def _load_messages(self) -> Dict:
-        """Load user messages from file"""
+    def _write_json(self, path: str, data: Dict):
+        """
+        Atomically replace a JSON file and refresh its cache entry.
+        Skips the write entirely if the serialized content is unchanged.
+        """
+        # Same indentation as json.dump(indent=2), but non-ASCII text (e.g. umlauts)
+        # is written as raw UTF-8 instead of \u escapes; both forms load the same
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        
+        cached = self._cache.get(path)
+        if cached is not None and cached[2] == payload:
+            try:
+                stat = os.stat(path)
+                if (stat.st_mtime_ns, stat.st_size) == cached[0]:
+                    return
+            except FileNotFoundError:
+                pass
+        
+        # Write to a temporary file and rename it over the original so readers
+        # never observe a partially written file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
         try:
-            with open(self.messages_file, 'r') as f:
-                return json.load(f)
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
         except:
-            return {}
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            # Callers mutate the cached dict in place, so drop the unsaved
+            # changes; the next read reparses what is actually on disk
+            self._cache.pop(path, None)
+            raise
+        
+        stat = os.stat(path)
+        self._cache[path] = ((stat.st_mtime_ns, stat.st_size), data, payload)
+    
+    @staticmethod
+    def _migrate_messages(messages: Dict):
+        """Convert one_time/dismissed lists from older files to dicts keyed by message id"""
+        for user_messages in messages.values():
+            for section in ("one_time", "dismissed"):
+                entries = user_messages.get(section, {})
+                if isinstance(entries, list):
+                    user_messages[section] = {msg["id"]: msg for msg in entries}
+    
+    def _load_messages(self) -> Dict:
+        """Load user messages from file"""
+        return self._read_json(self.messages_file, self._migrate_messages)
     
     def _save_messages(self, messages: Dict):
         """Save user messages to file"""
-        with open(self.messages_file, 'w') as f:
-            json.dump(messages, f, indent=2)
+        self._write_json(self.messages_file, messages)
     
     def _load_user_data(self) -> Dict:
         """Load user data from file"""
-        try:
-            with open(self.user_data_file, 'r') as f:
-                return json.load(f)
-        except:
-            return {}
+        return self._read_json(self.user_data_file)
     
     def _save_user_data(self, user_data: Dict):
         """Save user data to file"""
-        with open(self.user_data_file, 'w') as f:
-            json.dump(user_data, f, indent=2)
+        self._write_json(self.user_data_file, user_data)
     
-    def add_one_time_message(self, username: str, message: str, message_type: str = "info"):
-        """Add a one-time message for a user"""
-        messages = self._load_messages()
-        
+    def _append_one_time_message(self, messages: Dict, username: str, message: str,
+                                 message_type: str, created: datetime):
+        """Append a one-time message to the loaded messages dict (not saved)"""
         if username not in messages:
-            messages[username] = {"one_time": [], "dismissed": []}
+            messages[username] = {"one_time": {}, "dismissed": {}}
         
         message_data = {
-            "id": f"msg_{datetime.now().timestamp()}",
+            "id": f"msg_{created.timestamp()}",
             "message": message,
             "type": message_type,
-            "created": datetime.now().isoformat()
+            "created": created.isoformat()
         }
         
-        messages[username]["one_time"].append(message_data)
+        messages[username]["one_time"][message_data["id"]] = message_data
+    
+    def add_one_time_message(self, username: str, message: str, message_type: str = "info"):
+        """Add a one-time message for a user"""
+        messages = self._load_messages()
+        self._append_one_time_message(messages, username, message, message_type, datetime.now())
         self._save_messages(messages)
     
     def add_global_one_time_message(self, message: str, message_type: str = "info"):
-        """Add a one-time message for all users"""
+        """Add a one-time message for all users (one load and one save in total)"""
         from config import USERS
         
+        messages = self._load_messages()
+        created = datetime.now()
         for user in USERS:
-            self.add_one_time_message(user["username"], message, message_type)
+            self._append_one_time_message(messages, user["username"], message, message_type, created)
+        self._save_messages(messages)
     
     def dismiss_message(self, username: str, message_id: str):
         """Dismiss a specific message for a user"""
@@ -84,18 +179,13 @@ class MessageSystem:
         
         if username in messages:
             # Move from one_time to dismissed
-            one_time_messages = messages[username].get("one_time", [])
-            dismissed_messages = messages[username].get("dismissed", [])
-            
-            for i, msg in enumerate(one_time_messages):
-                if msg["id"] == message_id:
-                    dismissed_msg = one_time_messages.pop(i)
-                    dismissed_messages.append(dismissed_msg)
-                    break
+            one_time_messages = messages[username].setdefault("one_time", {})
+            dismissed_messages = messages[username].setdefault("dismissed", {})
             
-            messages[username]["one_time"] = one_time_messages
-            messages[username]["dismissed"] = dismissed_messages
-            self._save_messages(messages)
+            dismissed_msg = one_time_messages.pop(message_id, None)
+            if dismissed_msg is not None:
+                dismissed_messages[message_id] = dismissed_msg
+                self._save_messages(messages)
     
     def update_last_login(self, username: str, portfolio_value: float):
         """Update user's last login time and portfolio value"""
@@ -106,10 +196,13 @@ class MessageSystem:
         
         # Store previous values
         user_data[username]["previous_login"] = user_data[username].get("last_login")
+        user_data[username]["previous_login_ts"] = user_data[username].get("last_login_ts")
         user_data[username]["previous_portfolio_value"] = user_data[username].get("last_portfolio_value")
         
-        # Update current values
-        user_data[username]["last_login"] = datetime.now().isoformat()
+        # Update current values (the epoch timestamp spares readers an ISO parse)
+        now = datetime.now()
+        user_data[username]["last_login"] = now.isoformat()
+        user_data[username]["last_login_ts"] = now.timestamp()
         user_data[username]["last_portfolio_value"] = portfolio_value
         
         self._save_user_data(user_data)
@@ -127,10 +220,12 @@ class MessageSystem:
                 change = current_value - previous_value
                 change_pct = (change / previous_value * 100) if previous_value > 0 else 0
                 
-                # Parse previous login date
+                # Days since previous login, from the stored timestamp when available
                 try:
-                    prev_login_dt = datetime.fromisoformat(previous_login)
-                    days_ago = (datetime.now() - prev_login_dt).days
+                    previous_login_ts = user_data[username].get("previous_login_ts")
+                    if previous_login_ts is None:
+                        previous_login_ts = _parse_login_timestamp(previous_login)
+                    days_ago = int((time.time() - previous_login_ts) // 86400)
                     
                     if days_ago > 0:  # Only show if it's been at least a day
                         if change > 0:
@@ -170,18 +265,19 @@ class MessageSystem:
     
     def get_weekend_message(self, username: str) -> Optional[Dict]:
         """Get weekend trading message if it's weekend"""
-        # Get current time in Eastern Time (NYSE timezone)
-        try:
-            et_tz = pytz.timezone('US/Eastern')
-            now_et = datetime.now(et_tz)
-        except:
-            # Fallback to local time if timezone fails
-            now_et = datetime.now()
-        
         # For testing purposes, you can force weekend message by checking for test mode
         # Remove this after testing
         test_mode = False  # Set to False in production
         
+        # Cheap pre-check with integer math: Eastern time trails UTC by 4-5 hours,
+        # so an Eastern weekend can only overlap UTC Saturday, Sunday or Monday
+        utc_weekday = (int(time.time()) // 86400 + 3) % 7  # 1970-01-01 was a Thursday
+        if utc_weekday not in (5, 6, 0) and not test_mode:
+            return None
+        
+        # Get current time in Eastern Time (NYSE timezone)
+        now_et = datetime.now(EASTERN_TZ)
+        
         # Check if it's weekend (Saturday = 5, Sunday = 6) OR test mode
         if now_et.weekday() in [5, 6] or test_mode:  # Saturday or Sunday or test mode
             lang = get_language(username)
@@ -206,9 +302,24 @@ class MessageSystem:
     
     def show_messages(self, username: str, current_portfolio_value: float):
         """Display all pending messages for a user"""
+        # Only the weekend message is currently shown, and weekend status cannot
+        # change within a UTC hour (Eastern offsets are whole hours), so once this
+        # session found nothing to show it can skip the check until the next hour
+        if st.session_state.get("_no_messages_hour") == int(time.time() // 3600):
+            return
+        
+        self._render_messages(username, current_portfolio_value)
+    
+    @st.fragment
+    def _render_messages(self, username: str, current_portfolio_value: float):
+        """
+        Render the user's messages as a fragment, so dismissing one reruns only
+        this section instead of the whole dashboard
+        """
         messages = self.get_user_messages(username, current_portfolio_value)
         
         if not messages:
+            st.session_state["_no_messages_hour"] = int(time.time() // 3600)
             return
         
         # Display messages
@@ -225,16 +336,41 @@ class MessageSystem:
             else:
                 st.info(message_text)
             
-            # Add dismiss button for dismissible messages
+            # Add dismiss button for dismissible messages. The callback runs before
+            # the fragment reruns, so the dismissed message is simply not redrawn
             if msg.get("is_dismissible") and msg.get("id"):
                 col1, col2 = st.columns([4, 1])
                 with col2:
-                    if st.button("✕", key=f"dismiss_{msg['id']}", help="Dismiss"):
-                        self.dismiss_message(username, msg["id"])
-                        st.rerun()
+                    st.button(
+                        "✕",
+                        key=f"dismiss_{msg['id']}",
+                        help="Dismiss",
+                        on_click=self.dismiss_message,
+                        args=(username, msg["id"])
+                    )
         
         # Update last login after showing messages
-        self.update_last_login(username, current_portfolio_value)
+        self._persist_last_login(username, current_portfolio_value)
+    
+    def _persist_last_login(self, username: str, portfolio_value: float):
+        """
+        Call update_last_login unless this session already stored a nearly
+        identical value recently, so ordinary reruns don't rewrite the file
+        """
+        state_key = f"_last_persist_{username}"
+        now = time.time()
+        
+        last_persist = st.session_state.get(state_key)
+        if last_persist is not None:
+            last_time, last_value = last_persist
+            if (now - last_time < LAST_LOGIN_PERSIST_INTERVAL
+                    and abs(portfolio_value - last_value) < LAST_LOGIN_VALUE_TOLERANCE):
+                return
+        
+        self.update_last_login(username, portfolio_value)
+        st.session_state[state_key] = (now, portfolio_value)
 
-# Global message system instance
-message_system = MessageSystem()
+@st.cache_resource
+def get_message_system() -> MessageSystem:
+    """Shared message system instance for all sessions of this server process"""
+    return MessageSystem()
@@ -3,22 +3,79 @@ Portfolio dashboard for displaying user's portfolio overview
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from typing import List, Dict
-from price_fetcher import PriceFetcher
-from config import STOCKS
-from translations import get_language, get_text, format_currency, format_currency_change
+from price_fetcher import PriceFetcher, last_year_range
+from config import STOCKS, STOCK_SYMBOLS, STOCK_QTY, STOCK_PRICE
+from translations import get_language, get_text, format_currency, format_currency_change, make_currency_formatter
+
+# Columns of the per-stock frame used for vectorized dashboard calculations
+STOCK_FRAME_COLUMNS = ['symbol', 'name', 'industry', 'quantity', 'price',
+                       'current_price', 'previous_close', 'price_source']
+
+def stocks_frame(stocks: List[Dict], user_factor: float = 1.0) -> pd.DataFrame:
+    """
+    Build a columnar view of the stock dicts. Missing fields become NaN and
+    current_price falls back to the default price. your_quantity/your_value
+    hold the share given by user_factor (a user's portfolio_percentage).
+    The daily change metrics are computed here once for the metrics row and
+    holdings table: daily_change_pct and your_daily_change (0 where no
+    previous close is known).
+    """
+    df = pd.DataFrame(stocks).reindex(columns=STOCK_FRAME_COLUMNS)
+    numeric_columns = ['quantity', 'price', 'current_price', 'previous_close']
+    df[numeric_columns] = df[numeric_columns].astype(np.float64)
+    df['current_price'] = df['current_price'].fillna(df['price'])
+    df['your_quantity'] = df['quantity'] * user_factor
+    df['your_value'] = df['your_quantity'] * df['current_price']
+    df['daily_change_pct'] = daily_change_percentages(df)
+    df['your_daily_change'] = np.nan_to_num(
+        (df['current_price'] - df['previous_close']).to_numpy() * df['your_quantity'].to_numpy()
+    )
+    return df
+
+def daily_change_percentages(df: pd.DataFrame) -> np.ndarray:
+    """Daily price change % per stock (0 where no previous close is known)"""
+    current_prices = df['current_price'].to_numpy()
+    previous_closes = df['previous_close'].to_numpy()
+    valid = ~np.isnan(previous_closes) & (previous_closes != 0)
+    changes = np.zeros(len(df))
+    changes[valid] = (current_prices[valid] - previous_closes[valid]) / previous_closes[valid] * 100
+    return changes
+
+@st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes, like the current prices
+def cached_year_closes(_price_fetcher: PriceFetcher, start: str, end: str) -> pd.DataFrame:
+    """
+    Daily closes of all configured stocks between two ISO dates (end exclusive).
+    Called with last_year_range(), this is the single history shared by the
+    historical, individual stock and returns charts.
+    """
+    symbols = [symbol for symbol in STOCK_SYMBOLS if symbol != 'CASH']
+    return _price_fetcher.get_close_history(symbols, start, end)
+
+def color_daily_change(changes: pd.Series) -> np.ndarray:
+    """Styler colors for daily change %, decided on the value as displayed (2 decimals)"""
+    rounded = np.round(changes.to_numpy(), 2)
+    return np.where(rounded > 0, 'color: green', np.where(rounded < 0, 'color: red', 'color: gray'))
+
+def color_returns(returns: pd.Series) -> np.ndarray:
+    """Styler colors for returns: red when negative (shown with '-'), green otherwise, gray if missing"""
+    values = returns.to_numpy(dtype=np.float64)
+    return np.where(np.isnan(values), 'color: gray',
+                    np.where(np.signbit(values), 'color: red', 'color: green'))
 
 class PortfolioDashboard:
     def __init__(self, price_fetcher: PriceFetcher):
         self.price_fetcher = price_fetcher
     
-    def show_dashboard(self, user: Dict, stocks_with_prices: List[Dict], failed_symbols: List[str]):
+    def show_dashboard(self, user: Dict, stocks_with_prices: List[Dict], failed_symbols: List[str],
+                       user_portfolio_value: float):
         """Display the main portfolio dashboard"""
         
         lang = get_language(user['username'])
+        user_factor = user['portfolio_percentage']
         
         # Dashboard header
         st.title(get_text('portfolio_overview', lang, user['username'].title()))
@@ -31,89 +88,49 @@ class PortfolioDashboard:
                 for symbol in failed_symbols:
                     st.text(f"• {symbol}")
         
-        # Calculate portfolio metrics
-        total_portfolio_value = self.price_fetcher.get_portfolio_value(stocks_with_prices)
-        user_portfolio_value = total_portfolio_value * user['portfolio_percentage']
-        
         # Calculate returns and daily changes
         initial_investment = user.get('initial_investment', 0)
         total_return_amount = user_portfolio_value - initial_investment
         total_return_percentage = (total_return_amount / initial_investment * 100) if initial_investment > 0 else 0
         
-        # Calculate total daily change
-        total_daily_change = sum([
-            self.price_fetcher.get_user_daily_change_value(stock, user['portfolio_percentage'])
-            for stock in stocks_with_prices
-        ])
+        # Columnar view of the stocks, shared by the metrics, breakdown and holdings table
+        stocks_df = stocks_frame(stocks_with_prices, user_factor)
+        
+        # Daily change per stock for the user's portion (no previous close means no change)
+        daily_change_pct = stocks_df['daily_change_pct'].to_numpy()
+        daily_change_value = stocks_df['your_daily_change'].to_numpy()
         
-        # Calculate daily percentage change
+        # Calculate total daily change and daily percentage change
+        total_daily_change = float(daily_change_value.sum())
         daily_percentage = (total_daily_change / user_portfolio_value * 100) if user_portfolio_value > 0 else 0
         
-        # Calculate top performers for metrics row
-        stock_changes = []
-        for stock in stocks_with_prices:
-            if stock['symbol'] == 'CASH':
-                continue
-            daily_change_pct = self.price_fetcher.get_daily_change_percentage(stock)
-            daily_change_value = self.price_fetcher.get_user_daily_change_value(stock, user['portfolio_percentage'])
-            if stock.get('price_source') == 'live':
-                stock_changes.append({
-                    'symbol': stock['symbol'],
-                    'name': stock['name'],
-                    'daily_change_pct': daily_change_pct,
-                    'daily_change_value': daily_change_value,
-                    'current_price': stock.get('current_price', stock['price'])
-                })
-
-        # Key metrics row
-        col1, col2, col3, col4, col5, col6 = st.columns(6)
-
-        with col1:
-            st.metric(
-                label=get_text('your_portfolio_value', lang),
-                value=format_currency(user_portfolio_value, lang),
-                delta=None
-            )
-
-        with col2:
-            st.metric(
-                label=get_text('total_return', lang),
-                value=format_currency_change(total_return_amount, lang),
-                delta=f"{total_return_percentage:+.1f}%" if total_return_percentage != 0 else None
-            )
-
-        with col3:
-            st.metric(
-                label=get_text('daily_change', lang),
-                value=format_currency_change(total_daily_change, lang),
-                delta=f"{daily_percentage:+.2f}%" if daily_percentage != 0 else None
-            )
-
-        with col4:
-            live_count = len([s for s in stocks_with_prices if s.get('price_source') == 'live'])
-            st.metric(
-                label=get_text('live_prices', lang),
-                value=f"{live_count}/{len(stocks_with_prices)-1}",  # -1 for cash
-                delta=None
-            )
-
-        with col5:
-            if stock_changes:
-                top_pct_stock = max(stock_changes, key=lambda x: x['daily_change_pct'])
-                st.metric(
-                    label=get_text('top_daily_pct', lang),
-                    value=top_pct_stock['name'],
-                    delta=f"{top_pct_stock['daily_change_pct']:+.2f}%"
-                )
+        # Calculate top performers for metrics row (live, non-cash positions)
+        candidates = np.flatnonzero(
+            ((stocks_df['symbol'] != 'CASH') & (stocks_df['price_source'] == 'live')).to_numpy()
+        )
 
-        with col6:
-            if stock_changes:
-                top_value_stock = max(stock_changes, key=lambda x: x['daily_change_value'])
-                st.metric(
-                    label=get_text('top_daily_value', lang),
-                    value=top_value_stock['name'],
-                    delta=format_currency_change(top_value_stock['daily_change_value'], lang)
-                )
+        # Key metrics row as (label, value, delta), rendered in one pass
+        live_count = int((stocks_df['price_source'] == 'live').sum())
+        metrics = [
+            (get_text('your_portfolio_value', lang), format_currency(user_portfolio_value, lang), None),
+            (get_text('total_return', lang), format_currency_change(total_return_amount, lang),
+             f"{total_return_percentage:+.1f}%" if total_return_percentage != 0 else None),
+            (get_text('daily_change', lang), format_currency_change(total_daily_change, lang),
+             f"{daily_percentage:+.2f}%" if daily_percentage != 0 else None),
+            (get_text('live_prices', lang), f"{live_count}/{len(stocks_with_prices)-1}", None),  # -1 for cash
+        ]
+        if candidates.size:
+            top_pct_idx = candidates[np.argmax(daily_change_pct[candidates])]
+            top_value_idx = candidates[np.argmax(daily_change_value[candidates])]
+            metrics += [
+                (get_text('top_daily_pct', lang), stocks_df['name'].iat[top_pct_idx],
+                 f"{daily_change_pct[top_pct_idx]:+.2f}%"),
+                (get_text('top_daily_value', lang), stocks_df['name'].iat[top_value_idx],
+                 format_currency_change(daily_change_value[top_value_idx], lang)),
+            ]
+
+        for column, (label, value, delta) in zip(st.columns(6), metrics):
+            column.metric(label=label, value=value, delta=delta)
 
         st.markdown("---")
 
@@ -138,10 +155,10 @@ class PortfolioDashboard:
         st.markdown("---")
         
         # Portfolio breakdown charts
-        self.show_portfolio_breakdown(stocks_with_prices, user, lang)
+        self.show_portfolio_breakdown(stocks_df, user, lang)
         
         # Detailed holdings table
-        self.show_holdings_table(stocks_with_prices, user, lang)
+        self.show_holdings_table(stocks_df, user, lang)
     
     def show_all_users_overview(self, stocks_with_prices: List[Dict], lang: str):
         """Show overview of all users' portfolio values (only for 'user' account)"""
@@ -154,48 +171,36 @@ class PortfolioDashboard:
         # Calculate total portfolio value
         total_portfolio_value = self.price_fetcher.get_portfolio_value(stocks_with_prices)
         
-        # Prepare data for all users
-        user_data = []
-        for user_info in USERS:
-            if user_info['username'] != 'user':  # Skip the overview user itself
-                user_value = total_portfolio_value * user_info['portfolio_percentage']
-                initial_investment = user_info.get('initial_investment', 0)
-                total_return = user_value - initial_investment
-                return_percentage = (total_return / initial_investment * 100) if initial_investment > 0 else 0
-                
-                user_data.append({
-                    'User': user_info['username'].title(),
-                    'Portfolio Value': user_value,
-                    'Initial Investment': initial_investment,
-                    'Total Return': total_return,
-                    'Return %': return_percentage,
-                    'Share %': user_info['portfolio_percentage'] * 100
-                })
-        
-        # Sort by portfolio value descending
-        user_data.sort(key=lambda x: x['Portfolio Value'], reverse=True)
-        
-        # Create DataFrame
-        df = pd.DataFrame(user_data)
-        
-        # Format for display
-        formatted_df = df.copy()
-        formatted_df['Portfolio Value'] = formatted_df['Portfolio Value'].apply(lambda x: format_currency(x, lang))
-        formatted_df['Initial Investment'] = formatted_df['Initial Investment'].apply(lambda x: format_currency(x, lang))
-        formatted_df['Total Return'] = formatted_df['Total Return'].apply(lambda x: format_currency_change(x, lang))
-        formatted_df['Return %'] = formatted_df['Return %'].apply(lambda x: f"{x:+.1f}%")
-        formatted_df['Share %'] = formatted_df['Share %'].apply(lambda x: f"{x:.1f}%")
-        
-        # Style the dataframe
-        def color_returns(val):
-            if '+' in str(val):
-                return 'color: green'
-            elif '-' in str(val):
-                return 'color: red'
-            else:
-                return 'color: gray'
-        
-        styled_df = formatted_df.style.map(color_returns, subset=['Total Return', 'Return %'])
+        # Columnar data for all users (skipping the overview user itself)
+        users = [user_info for user_info in USERS if user_info['username'] != 'user']
+        shares = np.array([user_info['portfolio_percentage'] for user_info in users], dtype=np.float64)
+        initial_investments = np.array([user_info.get('initial_investment', 0) for user_info in users],
+                                       dtype=np.float64)
+        user_values = total_portfolio_value * shares
+        total_returns = user_values - initial_investments
+        invested = initial_investments > 0
+        return_percentages = np.zeros(len(users))
+        return_percentages[invested] = total_returns[invested] / initial_investments[invested] * 100
+        
+        # Create DataFrame, sorted by portfolio value descending
+        df = pd.DataFrame({
+            'User': [user_info['username'].title() for user_info in users],
+            'Portfolio Value': user_values,
+            'Initial Investment': initial_investments,
+            'Total Return': total_returns,
+            'Return %': return_percentages,
+            'Share %': shares * 100
+        }).sort_values('Portfolio Value', ascending=False, kind='stable', ignore_index=True)
+        
+        # Format and style the numeric values for display (no formatted copy)
+        currency_formatter = make_currency_formatter(lang)
+        styled_df = df.style.format({
+            'Portfolio Value': currency_formatter,
+            'Initial Investment': currency_formatter,
+            'Total Return': lambda x: format_currency_change(x, lang),
+            'Return %': '{:+.1f}%',
+            'Share %': '{:.1f}%'
+        }).apply(color_returns, subset=['Total Return', 'Return %'])
         
         st.dataframe(
             styled_df,
@@ -207,19 +212,23 @@ class PortfolioDashboard:
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            total_users = len(user_data)
+            total_users = len(df)
             st.metric("Active Users", total_users)
         
         with col2:
-            total_invested = sum([u['Initial Investment'] for u in user_data])
+            total_invested = df['Initial Investment'].sum()
             st.metric("Total Invested", format_currency(total_invested, lang))
         
         with col3:
-            current_total = sum([u['Portfolio Value'] for u in user_data])
+            current_total = df['Portfolio Value'].sum()
             st.metric("Current Total", format_currency(current_total, lang))
     
+    @st.fragment
     def show_historical_performance_chart(self, user: Dict, lang: str):
-        """Show historical portfolio performance vs URTH benchmark with progressive loading"""
+        """
+        Show historical portfolio performance vs URTH benchmark. Runs as a
+        fragment, so changing its timeframe or granularity reruns only this chart.
+        """
         
         st.subheader(get_text('historical_performance', lang))
         
@@ -254,11 +263,6 @@ class PortfolioDashboard:
                 index=2  # Default to monthly
             )
         
-        # Create containers for dynamic updates
-        chart_container = st.empty()
-        progress_container = st.empty()
-        metrics_container = st.empty()
-        
         # Calculate date range based on selected timeframe
         from datetime import datetime, timedelta
         end_date = datetime.now()
@@ -273,10 +277,7 @@ class PortfolioDashboard:
         
         start_date = end_date - timedelta(days=timeframe_days[selected_timeframe])
         
-        # Create sample dates based on granularity
-        sample_dates = []
-        current_date = start_date
-        
+        # Create sample dates based on granularity (from the start date, every interval up to today)
         if selected_granularity == 'daily':
             interval_days = 1
         elif selected_granularity == 'weekly':
@@ -284,28 +285,33 @@ class PortfolioDashboard:
         else:  # monthly
             interval_days = 30
             
-        while current_date <= end_date:
-            sample_dates.append(current_date)
-            current_date += timedelta(days=interval_days)
+        sample_dates = pd.date_range(start=start_date, end=end_date, freq=f'{interval_days}D')
         
-        # Initialize chart with all values at 100
-        initial_portfolio_values = [100] * len(sample_dates)
-        initial_urth_values = [100] * len(sample_dates)
+        # Shared daily closes of the last year, covering every sample date's ±5 day window
+        with st.spinner(get_text('loading_historical_data', lang)):
+            closes = cached_year_closes(self.price_fetcher, *last_year_range())
         
-        # Create initial chart
+        # Portfolio and URTH values per date, relative to the first date (= 100)
+        values = self._get_dates_data(sample_dates, user, closes)
+        bases = values[0]
+        relative_values = np.where(bases > 0, values / np.where(bases > 0, bases, 1) * 100, 100)
+        portfolio_values = relative_values[:, 0].tolist()
+        urth_values = relative_values[:, 1].tolist()
+        
+        # Create the chart
         fig = go.Figure()
         
-        portfolio_trace = fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scatter(
             x=sample_dates,
-            y=initial_portfolio_values,
+            y=portfolio_values,
             mode='lines',
             name='Your Portfolio',
             line=dict(color='#1f77b4', width=3)
         ))
         
-        urth_trace = fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scatter(
             x=sample_dates,
-            y=initial_urth_values,
+            y=urth_values,
             mode='lines',
             name='URTH Benchmark',
             line=dict(color='#ff7f0e', width=2, dash='dash')
@@ -327,6 +333,7 @@ class PortfolioDashboard:
             yaxis_title=get_text('relative_performance', lang),
             height=400,
             hovermode='x unified',
+            uirevision='historical_performance',  # Keep zoom/pan when the chart is redrawn
             legend=dict(
                 yanchor="top",
                 y=0.99,
@@ -335,156 +342,78 @@ class PortfolioDashboard:
             )
         )
         
-        # Show initial chart
-        with chart_container.container():
-            st.plotly_chart(fig, use_container_width=True, key="historical_chart")
-        
-        # Initialize arrays for progressive loading
-        portfolio_values = [100] * len(sample_dates)
-        urth_values = [100] * len(sample_dates)
-        
-        # Progressive data loading
-        total_points = len(sample_dates)
-        
-        with progress_container.container():
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-        
-        # Load data for each date progressively
-        for i, date in enumerate(sample_dates):
-            # Format date display based on granularity
-            if selected_granularity == 'daily':
-                date_str = date.strftime('%Y-%m-%d')
-            elif selected_granularity == 'weekly':
-                date_str = date.strftime('%Y-W%U')
-            else:  # monthly
-                date_str = date.strftime('%B %Y')
-                
-            status_text.text(f"Loading data for {date_str}... ({i+1}/{total_points})")
-            
-            # Get real data for this date
-            portfolio_value, urth_value = self._get_single_date_data(date, user)
-            
-            # Store the actual values
-            if i == 0:
-                # First point establishes the base
-                portfolio_base = portfolio_value
-                urth_base = urth_value
-                portfolio_values[i] = 100
-                urth_values[i] = 100
-            else:
-                # Calculate relative values
-                portfolio_values[i] = (portfolio_value / portfolio_base) * 100 if portfolio_base > 0 else 100
-                urth_values[i] = (urth_value / urth_base) * 100 if urth_base > 0 else 100
-            
-            # Update chart
-            fig.data[0].y = portfolio_values[:i+1] + [100] * (len(sample_dates) - i - 1)
-            fig.data[1].y = urth_values[:i+1] + [100] * (len(sample_dates) - i - 1)
-            
-            # Update the chart display
-            with chart_container.container():
-                st.plotly_chart(fig, use_container_width=True, key=f"historical_chart_{i}")
-            
-            # Update progress
-            progress_bar.progress((i + 1) / total_points)
-            
-            # Small delay for visual effect
-            import time
-            time.sleep(0.3)
-        
-        # Final update with complete data
-        fig.data[0].y = portfolio_values
-        fig.data[1].y = urth_values
-        
-        with chart_container.container():
-            st.plotly_chart(fig, use_container_width=True, key="historical_chart_final")
-        
-        # Clear progress indicators
-        progress_container.empty()
+        st.plotly_chart(fig, use_container_width=True, key="historical_chart")
         
         # Show final metrics
         if len(portfolio_values) > 1:
             portfolio_change = portfolio_values[-1] - 100
             urth_change = urth_values[-1] - 100
             
-            with metrics_container.container():
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    st.metric(
-                        "Your Performance", 
-                        f"{portfolio_values[-1]:.1f}",
-                        f"{portfolio_change:+.1f}"
-                    )
-                
-                with col2:
-                    st.metric(
-                        "URTH Performance", 
-                        f"{urth_values[-1]:.1f}",
-                        f"{urth_change:+.1f}"
-                    )
-                
-                with col3:
-                    outperformance = portfolio_change - urth_change
-                    st.metric(
-                        "Outperformance",
-                        f"{outperformance:+.1f}",
-                        delta_color="normal" if outperformance >= 0 else "inverse"
-                    )
-    
-    def _get_single_date_data(self, date, user):
-        """Get portfolio and URTH values for a single date"""
-        try:
-            import yfinance as yf
-            from datetime import timedelta
+            col1, col2, col3 = st.columns(3)
             
-            total_portfolio_value = 0
-            urth_price = None
+            with col1:
+                st.metric(
+                    "Your Performance", 
+                    f"{portfolio_values[-1]:.1f}",
+                    f"{portfolio_change:+.1f}"
+                )
+            
+            with col2:
+                st.metric(
+                    "URTH Performance", 
+                    f"{urth_values[-1]:.1f}",
+                    f"{urth_change:+.1f}"
+                )
             
-            # Get data for each stock on this date
-            for stock in STOCKS:
-                if stock['symbol'] == 'CASH':
-                    total_portfolio_value += stock['quantity'] * 1.0
-                    continue
+            with col3:
+                outperformance = portfolio_change - urth_change
+                st.metric(
+                    "Outperformance",
+                    f"{outperformance:+.1f}",
+                    delta_color="normal" if outperformance >= 0 else "inverse"
+                )
+    
+    def _get_dates_data(self, dates, user, closes: pd.DataFrame) -> np.ndarray:
+        """
+        Get portfolio and URTH values for each date from daily closes (see
+        get_close_history), as an array with one (portfolio, URTH) row per date
+        """
+        try:
+            # Each stock uses its last close within ±5 days of the date, the default price otherwise
+            dates = pd.DatetimeIndex(dates)
+            date_prices = np.tile(STOCK_PRICE, (len(dates), 1))
+            if not closes.empty:
+                prices = closes.reindex(columns=STOCK_SYMBOLS).to_numpy(dtype=np.float64)
+                window_starts = closes.index.searchsorted(dates - pd.Timedelta(days=5), side='left')
+                window_ends = closes.index.searchsorted(dates + pd.Timedelta(days=5), side='left') - 1
                 
-                try:
-                    ticker = yf.Ticker(stock['symbol'])
-                    # Get data around this date
-                    hist = ticker.history(start=date - timedelta(days=5), end=date + timedelta(days=5))
-                    
-                    if not hist.empty:
-                        # Use the closest available price
-                        price = float(hist['Close'].iloc[-1])
-                    else:
-                        # Fallback to default price
-                        price = stock['price']
-                    
-                    if stock['symbol'] == 'URTH':
-                        urth_price = price
-                    
-                    total_portfolio_value += stock['quantity'] * price
-                    
-                except:
-                    # Use default price if error
-                    price = stock['price']
-                    if stock['symbol'] == 'URTH':
-                        urth_price = price
-                    total_portfolio_value += stock['quantity'] * price
+                # Row of the latest available close per stock up to each row (-1 if none yet)
+                latest_rows = np.maximum.accumulate(
+                    np.where(np.isnan(prices), -1, np.arange(len(prices))[:, None]), axis=0
+                )
+                rows = latest_rows[np.maximum(window_ends, 0)]
+                in_window = (window_ends >= 0)[:, None] & (rows >= window_starts[:, None])
+                date_prices = np.where(in_window, prices[rows, np.arange(len(STOCK_SYMBOLS))], date_prices)
             
             # Calculate user's portfolio value
-            user_portfolio_value = total_portfolio_value * user['portfolio_percentage']
+            user_portfolio_values = date_prices @ STOCK_QTY * user['portfolio_percentage']
             
             # If no URTH price found, use default
-            if urth_price is None:
-                urth_price = next((s['price'] for s in STOCKS if s['symbol'] == 'URTH'), 100)
+            is_urth = STOCK_SYMBOLS == 'URTH'
+            urth_prices = (date_prices[:, is_urth][:, 0] if is_urth.any()
+                           else np.full(len(dates), self._default_urth_price()))
             
-            return user_portfolio_value, urth_price
+            return np.column_stack([user_portfolio_values, urth_prices])
             
         except Exception as e:
             # Return default values on error
-            default_portfolio = sum(s['quantity'] * s['price'] for s in STOCKS) * user['portfolio_percentage']
-            default_urth = next((s['price'] for s in STOCKS if s['symbol'] == 'URTH'), 100)
-            return default_portfolio, default_urth
+            default_portfolio = float(np.dot(STOCK_QTY, STOCK_PRICE)) * user['portfolio_percentage']
+            return np.tile([default_portfolio, self._default_urth_price()], (len(dates), 1))
+    
+    def _default_urth_price(self) -> float:
+        """Configured default price of the URTH benchmark"""
+        urth_prices = STOCK_PRICE[STOCK_SYMBOLS == 'URTH']
+        return float(urth_prices[0]) if urth_prices.size else 100
     
     def show_individual_stock_performance_chart(self, user: Dict, lang: str):
         """Show yearly performance graph for each individual stock in the portfolio"""
@@ -492,52 +421,33 @@ class PortfolioDashboard:
 
         st.subheader(get_text('individual_stock_performance', lang))
 
-        # We can reuse the historical data that was already loaded for the portfolio performance
-        # Get 1-year data for all stocks
-        from datetime import datetime, timedelta
-
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=365)
-
-        # Create a progress indicator
-        progress_text = st.empty()
-        progress_bar = st.progress(0)
-
-        # Get all non-cash stocks
-        non_cash_stocks = [s for s in STOCKS if s['symbol'] != 'CASH']
-        total_stocks = len(non_cash_stocks)
+        # Slice the last 365 days from the shared daily closes
+        with st.spinner(get_text('loading_historical_data', lang)):
+            closes = cached_year_closes(self.price_fetcher, *last_year_range())
+        closes = closes.loc[closes.index >= pd.Timestamp.now().normalize() - pd.Timedelta(days=365)]
 
-        # Collect data for all stocks
+        # Collect data for all stocks (skipping stocks without history)
         all_stock_data = []
 
-        for idx, stock in enumerate(non_cash_stocks):
-            progress_text.text(f"Loading data for {stock['symbol']}... ({idx + 1}/{total_stocks})")
-            progress_bar.progress((idx + 1) / total_stocks)
-
-            try:
-                import yfinance as yf
-                ticker = yf.Ticker(stock['symbol'])
-                hist = ticker.history(start=start_date, end=end_date)
-
-                if not hist.empty and len(hist) > 1:
-                    # Normalize to percentage change from start
-                    base_price = float(hist['Close'].iloc[0])
-                    dates = hist.index.tolist()
-                    normalized_values = [((float(price) - base_price) / base_price * 100) for price in hist['Close']]
-
-                    all_stock_data.append({
-                        'symbol': stock['symbol'],
-                        'name': stock['name'],
-                        'dates': dates,
-                        'values': normalized_values
-                    })
-            except Exception:
-                # Skip stocks that fail to load
+        for stock in STOCKS:
+            if stock['symbol'] not in closes.columns:
                 continue
 
-        # Clear progress indicators
-        progress_text.empty()
-        progress_bar.empty()
+            # Only this symbol's trading days (the batch aligns all symbols' dates)
+            symbol_closes = closes[stock['symbol']].dropna()
+
+            if len(symbol_closes) > 1:
+                # Normalize to percentage change from start
+                prices = symbol_closes.to_numpy(dtype=np.float64)
+                base_price = prices[0]
+                normalized_values = (prices - base_price) / base_price * 100
+
+                all_stock_data.append({
+                    'symbol': stock['symbol'],
+                    'name': stock['name'],
+                    'dates': symbol_closes.index.tolist(),
+                    'values': normalized_values
+                })
 
         # Create the chart with all stocks
         if all_stock_data:
@@ -614,8 +524,12 @@ class PortfolioDashboard:
         else:
             st.warning(get_text('no_yearly_data_available', lang))
 
+    @st.fragment
     def show_returns_chart(self, user: Dict, lang: str):
-        """Show position returns chart with time period selector"""
+        """
+        Show position returns chart with time period selector. Runs as a
+        fragment, so changing the period reruns only this chart.
+        """
         # Note: user parameter kept for consistency with other chart methods
 
         st.subheader(get_text('position_returns', lang))
@@ -642,74 +556,55 @@ class PortfolioDashboard:
         
         # Fetch historical data for selected period
         with st.spinner(f"Loading {period_labels[selected_period]} data..."):
-            historical_stocks = self.price_fetcher.get_historical_data(STOCKS, selected_period)
+            closes = cached_year_closes(self.price_fetcher, *last_year_range())
+            historical = self.price_fetcher.get_historical_data(STOCKS, selected_period, closes)
         
         # Prepare data for chart
-        returns_data = []
-        for stock in historical_stocks:
-            if stock['symbol'] == 'CASH':  # Skip cash
-                continue
-                
-            change_percentage = stock.get('historical_change', 0)
-            
-            # Only include positions with meaningful changes or if they have live prices
-            if abs(change_percentage) > 0.01 or stock.get('price_source') == 'live':
-                # Special color for URTH (benchmark)
-                if stock['symbol'] == 'URTH':
-                    color = '#1f77b4'  # Blue for benchmark
-                else:
-                    color = '#00AA00' if change_percentage >= 0 else '#FF4444'  # Green/red for others
-                
-                returns_data.append({
-                    'Symbol': stock['symbol'],
-                    'Name': stock['name'],
-                    'Return (%)': change_percentage,
-                    'Color': color,
-                    'Is_Benchmark': stock['symbol'] == 'URTH'
-                })
+        symbols = historical['symbol']
+        changes = historical['historical_change']
+        
+        # Only include positions (not cash) with meaningful changes or if they have live prices
+        shown = (symbols != 'CASH') & ((np.abs(changes) > 0.01) | (historical['price_source'] == 'live'))
+        is_benchmark = symbols == 'URTH'
+        
+        # Put URTH (benchmark) first, then other stocks sorted by return (highest gain to highest loss)
+        others = np.flatnonzero(shown & ~is_benchmark)
+        order = np.concatenate([
+            np.flatnonzero(shown & is_benchmark),
+            others[np.argsort(-changes[others], kind='stable')]
+        ])
         
-        if returns_data:
-            # Separate URTH (benchmark) from other stocks
-            urth_data = [x for x in returns_data if x['Symbol'] == 'URTH']
-            other_data = [x for x in returns_data if x['Symbol'] != 'URTH']
-            
-            # Sort other stocks by return percentage (highest gain to highest loss)
-            other_data.sort(key=lambda x: x['Return (%)'], reverse=True)
-            
-            # Put URTH first, then other stocks
-            returns_data = urth_data + other_data
-            
-            df = pd.DataFrame(returns_data)
+        if order.size:
+            chart_symbols = symbols[order]
+            returns = changes[order]
             
-            # Create the bar chart
-            fig = px.bar(
-                df,
-                x='Symbol',
-                y='Return (%)',
-                title=f"{get_text('position_returns', lang)} - {period_labels[selected_period]}",
-                color='Color',
-                color_discrete_map='identity',  # Use the colors as provided
-                hover_data={
-                    'Name': True,
-                    'Return (%)': ':.2f'
-                }
-            )
+            # Create the bar chart; special color for URTH (benchmark), green/red for others
+            fig = go.Figure(go.Bar(
+                x=chart_symbols,
+                y=returns,
+                customdata=historical['name'][order],
+                marker_color=np.where(is_benchmark[order], '#1f77b4',
+                                      np.where(returns >= 0, '#00AA00', '#FF4444')),
+                hovertemplate='Symbol=%{x}<br>Return (%)=%{y:.2f}<br>Name=%{customdata}<extra></extra>'
+            ))
             
             # Customize the chart
             fig.update_layout(
+                title=f"{get_text('position_returns', lang)} - {period_labels[selected_period]}",
                 xaxis_title="",
                 yaxis_title="Return (%)",
                 showlegend=False,
                 height=400,
-                xaxis_tickangle=-45
+                xaxis_tickangle=-45,
+                uirevision='position_returns'  # Keep zoom/pan when the chart is redrawn
             )
             
             # Add zero line
             fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
             
             # Add URTH benchmark line
-            urth_return = next((item['Return (%)'] for item in returns_data if item['Symbol'] == 'URTH'), None)
-            if urth_return is not None:
+            if chart_symbols[0] == 'URTH':
+                urth_return = returns[0]
                 fig.add_hline(
                     y=urth_return, 
                     line_dash="dot", 
@@ -722,9 +617,9 @@ class PortfolioDashboard:
             st.plotly_chart(fig, use_container_width=True)
             
             # Summary stats
-            winners = len([x for x in returns_data if x['Return (%)'] > 0])
-            losers = len([x for x in returns_data if x['Return (%)'] < 0])
-            unchanged = len([x for x in returns_data if x['Return (%)'] == 0])
+            losers, unchanged, winners = (
+                int(count) for count in np.bincount(np.sign(returns).astype(np.intp) + 1, minlength=3)
+            )
             
             col1, col2, col3 = st.columns(3)
             with col1:
@@ -736,130 +631,108 @@ class PortfolioDashboard:
         else:
             st.info(f"No {period_labels[selected_period].lower()} data available (all using default prices)")
     
-    def show_portfolio_breakdown(self, stocks: List[Dict], user: Dict, lang: str):
-        """Show portfolio breakdown charts"""
+    def show_portfolio_breakdown(self, stocks_df: pd.DataFrame, user: Dict, lang: str):
+        """Show portfolio breakdown charts (stocks_df as built by stocks_frame)"""
+        
+        # User's value per stock, shared by both charts
+        values = stocks_df['your_value'].to_numpy()
         
         col1, col2 = st.columns(2)
         
         with col1:
             st.subheader(get_text('portfolio_allocation', lang))
             
-            # Prepare data for pie chart
-            chart_data = []
-            for stock in stocks:
-                value = self.price_fetcher.get_stock_value(stock) * user['portfolio_percentage']
-                if value > 0:  # Only show non-zero values
-                    chart_data.append({
-                        'Symbol': stock['symbol'],
-                        'Name': stock['name'],
-                        'Value': value,
-                        'Industry': stock.get('industry', 'Other')
-                    })
-            
-            df = pd.DataFrame(chart_data)
-            
-            if not df.empty:
-                fig = px.pie(
-                    df, 
-                    values='Value', 
-                    names='Symbol',
-                    hover_data=['Name', 'Industry'],
-                    title=get_text('holdings_distribution', lang)
-                )
-                fig.update_traces(textposition='inside', textinfo='percent+label')
+            # Prepare data for pie chart (only non-zero values)
+            shown = values > 0
+            
+            if shown.any():
+                fig = go.Figure(go.Pie(
+                    labels=stocks_df['symbol'].to_numpy()[shown],
+                    values=values[shown],
+                    customdata=np.stack([stocks_df['name'].to_numpy()[shown],
+                                         stocks_df['industry'].to_numpy()[shown]], axis=-1),
+                    hovertemplate='Symbol=%{label}<br>Value=%{value}<br>Name=%{customdata[0]}'
+                                  '<br>Industry=%{customdata[1]}<extra></extra>',
+                    textposition='inside',
+                    textinfo='percent+label'
+                ))
+                fig.update_layout(title=get_text('holdings_distribution', lang))
                 st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             st.subheader(get_text('industry_breakdown', lang))
             
-            # Group by industry
-            industry_data = {}
-            for stock in stocks:
-                industry = stock.get('industry', 'Other')
-                if industry is None:
-                    industry = 'Cash'
-                value = self.price_fetcher.get_stock_value(stock) * user['portfolio_percentage']
-                
-                if industry in industry_data:
-                    industry_data[industry] += value
-                else:
-                    industry_data[industry] = value
+            # Group by industry (cash has no industry)
+            industry_values = pd.Series(values).groupby(
+                stocks_df['industry'].fillna('Cash').to_numpy(), sort=False
+            ).sum()
             
-            industry_df = pd.DataFrame([
-                {'Industry': k, 'Value': v} 
-                for k, v in industry_data.items() 
-                if v > 0
-            ])
+            # Sort by value descending (highest to lowest)
+            industry_values = industry_values[industry_values > 0].sort_values(ascending=False)
             
-            if not industry_df.empty:
-                # Sort by value descending (highest to lowest)
-                industry_df = industry_df.sort_values('Value', ascending=False)
-                
-                fig = px.bar(
-                    industry_df, 
-                    x='Industry', 
-                    y='Value',
-                    title=get_text('holdings_by_industry', lang)
+            if not industry_values.empty:
+                fig = go.Figure(go.Bar(
+                    x=industry_values.index.to_numpy(),
+                    y=industry_values.to_numpy(),
+                    hovertemplate='Industry=%{x}<br>Value=%{y}<extra></extra>'
+                ))
+                fig.update_layout(
+                    title=get_text('holdings_by_industry', lang),
+                    xaxis_title='Industry',
+                    yaxis_title='Value',
+                    xaxis_tickangle=-45
                 )
-                fig.update_layout(xaxis_tickangle=-45)
                 st.plotly_chart(fig, use_container_width=True)
     
-    def show_holdings_table(self, stocks: List[Dict], user: Dict, lang: str):
+    def show_holdings_table(self, stocks_df: pd.DataFrame, user: Dict, lang: str):
         """Show detailed holdings table"""
         
         st.subheader(get_text('detailed_holdings', lang))
         
-        # Prepare table data
-        table_data = []
-        for stock in stocks:
-            current_price = stock.get('current_price', stock['price'])
-            your_quantity = stock['quantity'] * user['portfolio_percentage']
-            your_value = your_quantity * current_price
-            daily_change_pct = self.price_fetcher.get_daily_change_percentage(stock)
-            
-            industry = stock.get('industry', 'N/A')
-            # Translate industry names
-            if industry:
-                industry = get_text(industry, lang)
-            
-            table_data.append({
-                get_text('symbol', lang): stock['symbol'],
-                get_text('name', lang): stock['name'],
-                get_text('industry', lang): industry,
-                get_text('your_quantity', lang): your_quantity,
-                get_text('current_price', lang): current_price,
-                get_text('your_value', lang): your_value,
-                get_text('daily_change', lang): f"{daily_change_pct:+.2f}%",
-                get_text('price_source', lang): stock.get('price_source', 'default').title()
-            })
-        
-        df = pd.DataFrame(table_data)
-        
-        # Sort by value descending
-        df = df.sort_values(get_text('your_value', lang), ascending=False)
-        
-        # Format the dataframe for display
-        formatted_df = df.copy()
+        # Resolve translated column labels once
+        symbol_col = get_text('symbol', lang)
+        name_col = get_text('name', lang)
+        industry_col = get_text('industry', lang)
         your_quantity_col = get_text('your_quantity', lang)
         current_price_col = get_text('current_price', lang)
         your_value_col = get_text('your_value', lang)
         daily_change_col = get_text('daily_change', lang)
+        price_source_col = get_text('price_source', lang)
+        
+        # Prepare table data column-wise from the frame of all stocks
+        your_quantity = stocks_df['your_quantity']
+        your_value = stocks_df['your_value']
+        is_cash = stocks_df['symbol'] == 'CASH'
+        
+        # Translate each distinct industry name once (cash has no industry)
+        industries = stocks_df['industry']
+        industry_map = {
+            industry: get_text(industry, lang) if industry else industry
+            for industry in industries.unique()
+        }
         
-        formatted_df[your_quantity_col] = formatted_df[your_quantity_col].apply(lambda x: f"{x:.2f}" if x < 1000 else f"{x:,.0f}")
-        formatted_df[current_price_col] = formatted_df[current_price_col].apply(lambda x: format_currency(x, lang))
-        formatted_df[your_value_col] = formatted_df[your_value_col].apply(lambda x: format_currency(x, lang))
-        # Daily change is already formatted
+        df = pd.DataFrame({
+            symbol_col: stocks_df['symbol'],
+            name_col: stocks_df['name'],
+            industry_col: industries.map(industry_map.get),
+            your_quantity_col: your_quantity,
+            current_price_col: stocks_df['current_price'],
+            your_value_col: your_value,
+            daily_change_col: stocks_df['daily_change_pct'],
+            price_source_col: stocks_df['price_source'].fillna('default').str.title()
+        })
         
-        # Style the dataframe
-        def color_daily_change(val):
-            if '0.00%' in str(val) or 'N/A' in str(val):
-                return 'color: gray'
-            elif '+' in str(val):
-                return 'color: green'
-            else:
-                return 'color: red'
+        # Sort by value descending
+        df = df.sort_values(your_value_col, ascending=False)
         
-        styled_df = formatted_df.style.map(color_daily_change, subset=[daily_change_col])
+        # Style the dataframe; numbers stay numeric and are only formatted for display
+        currency_formatter = make_currency_formatter(lang)
+        styled_df = df.style.format({
+            your_quantity_col: lambda quantity: f"{quantity:.2f}" if quantity < 1000 else f"{quantity:,.0f}",
+            current_price_col: currency_formatter,
+            your_value_col: currency_formatter,
+            daily_change_col: '{:+.2f}%'
+        }).apply(color_daily_change, subset=[daily_change_col])
         
         st.dataframe(
             styled_df,
@@ -870,16 +743,15 @@ class PortfolioDashboard:
         # Summary statistics
         col1, col2, col3 = st.columns(3)
         
+        total_non_cash = int((~is_cash).sum())
+        
         with col1:
-            total_positions = len([s for s in stocks if s['symbol'] != 'CASH'])
-            st.metric(get_text('total_positions', lang), total_positions)
+            st.metric(get_text('total_positions', lang), total_non_cash)
         
         with col2:
-            cash_value = next((self.price_fetcher.get_stock_value(s) * user['portfolio_percentage'] 
-                             for s in stocks if s['symbol'] == 'CASH'), 0)
+            cash_value = float(your_value[is_cash].sum())
             st.metric(get_text('cash_position', lang), format_currency(cash_value, lang))
         
         with col3:
-            live_prices = len([s for s in stocks if s.get('price_source') == 'live'])
-            total_non_cash = len([s for s in stocks if s['symbol'] != 'CASH'])
+            live_prices = int((stocks_df['price_source'] == 'live').sum())
             st.metric(get_text('live_price_coverage', lang), f"{live_prices}/{total_non_cash}")
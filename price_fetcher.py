@@ -3,12 +3,26 @@ Stock price fetching functionality with fallback to default values
 """
 
 import yfinance as yf
+import numpy as np
 import pandas as pd
 import streamlit as st
-from typing import Dict, List, Tuple
-import time
+from typing import Dict, List, Optional, Tuple
 from translations import get_language, get_text, format_currency, format_currency_change
 
+def priced_stock(stock: Dict, current_price: float, previous_close: Optional[float], price_source: str) -> Dict:
+    """Copy of a stock with its current price, previous close and price source"""
+    return {**stock, 'current_price': current_price, 'previous_close': previous_close,
+            'price_source': price_source}
+
+def last_year_range() -> Tuple[str, str]:
+    """
+    ISO start and (exclusive) end dates covering the last year of daily closes,
+    plus a week before it for lookback windows around the earliest dates
+    """
+    today = pd.Timestamp.now().normalize()
+    return ((today - pd.DateOffset(years=1, weeks=1)).date().isoformat(),
+            (today + pd.Timedelta(days=1)).date().isoformat())
+
 class PriceFetcher:
     def __init__(self):
         self.failed_symbols = []
@@ -16,7 +30,9 @@ class PriceFetcher:
     def fetch_stock_prices(self, stocks: List[Dict], language: str = 'en') -> Tuple[List[Dict], List[str]]:
         """
         Fetch current stock prices using yfinance
-        Returns updated stocks list and list of symbols that failed to fetch
+        Returns updated stocks list and list of symbols that failed to fetch.
+        Every returned stock has current_price set (the default price if no
+        live price is available).
         """
         updated_stocks = []
         failed_symbols = []
@@ -30,188 +46,175 @@ class PriceFetcher:
             # Simple status text
             status_text = st.empty()
             
-        non_cash_stocks = [s for s in stocks if s["symbol"] != "CASH"]
-        total_stocks = len(non_cash_stocks)
+        non_cash_symbols = [s["symbol"] for s in stocks if s["symbol"] != "CASH"]
+        total_stocks = len(non_cash_symbols)
         
-        for i, stock in enumerate(stocks):
+        status_text.text(f"{get_text('fetching_prices', language)} ({total_stocks})")
+        
+        # Latest closes of all symbols, shared across languages and sessions
+        latest_closes = cached_latest_closes(self, tuple(non_cash_symbols))
+        
+        progress_bar.progress(1.0)
+        
+        for stock in stocks:
             symbol = stock["symbol"]
             
-            # Skip cash
             if symbol == "CASH":
-                updated_stocks.append(stock.copy())
-                continue
-                
-            current_index = len([s for s in updated_stocks if s["symbol"] != "CASH"])
-            
-            # Update status
-            status_text.text(f"{get_text('fetching_price_for', language, symbol)} ({current_index + 1}/{total_stocks})")
-            
-            try:
-                # Fetch stock data
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(period="1d")
-                
-                if not hist.empty:
-                    # Get current and previous closing prices
-                    current_price = float(hist['Close'].iloc[-1])
-                    
-                    # Get previous day's close if available
-                    previous_close = None
-                    if len(hist) > 1:
-                        previous_close = float(hist['Close'].iloc[-2])
-                    elif 'Open' in hist.columns:
-                        previous_close = float(hist['Open'].iloc[-1])
-                    
-                    # Update stock with current price
-                    updated_stock = stock.copy()
-                    updated_stock['current_price'] = current_price
-                    updated_stock['previous_close'] = previous_close
-                    updated_stock['price_source'] = 'live'
-                    updated_stocks.append(updated_stock)
-                else:
-                    # No data available, use default price
-                    updated_stock = stock.copy()
-                    updated_stock['current_price'] = stock['price']
-                    updated_stock['previous_close'] = stock['price']  # No change data
-                    updated_stock['price_source'] = 'default'
-                    updated_stocks.append(updated_stock)
-                    failed_symbols.append(symbol)
-                    
-            except Exception as e:
-                # Error fetching data, use default price
-                updated_stock = stock.copy()
-                updated_stock['current_price'] = stock['price']
-                updated_stock['previous_close'] = stock['price']  # No change data
-                updated_stock['price_source'] = 'default'
-                updated_stocks.append(updated_stock)
+                # Cash price never changes, but current_price is always set
+                updated_stocks.append({**stock, 'current_price': stock['price']})
+            elif symbol in latest_closes:
+                current_price, previous_close = latest_closes[symbol]
+                updated_stocks.append(priced_stock(stock, current_price, previous_close, 'live'))
+            else:
+                # No data available, use default price (no change data)
+                updated_stocks.append(priced_stock(stock, stock['price'], stock['price'], 'default'))
                 failed_symbols.append(symbol)
-                
-            # Update progress bar
-            current_progress = len([s for s in updated_stocks if s["symbol"] != "CASH"])
-            progress_percentage = current_progress / total_stocks
-            progress_bar.progress(progress_percentage)
-            
-            # Small delay to avoid hitting rate limits
-            time.sleep(0.1)
         
-        # Keep completed status briefly then clear
-        status_text.text(f"✅ Completed! ({total_stocks}/{total_stocks})")
-        time.sleep(1.0)
+        # Clear the progress display
         progress_container.empty()
         
         return updated_stocks, failed_symbols
     
-    def get_portfolio_value(self, stocks: List[Dict]) -> float:
-        """Calculate total portfolio value"""
-        total_value = 0
-        for stock in stocks:
-            current_price = stock.get('current_price', stock['price'])
-            total_value += stock['quantity'] * current_price
-        return total_value
-    
-    def get_stock_value(self, stock: Dict) -> float:
-        """Get individual stock total value"""
-        current_price = stock.get('current_price', stock['price'])
-        return stock['quantity'] * current_price
-    
-    def get_price_change_percentage(self, stock: Dict) -> float:
-        """Calculate price change percentage from default to current"""
-        if stock.get('price_source') == 'default':
-            return 0.0
+    def get_latest_closes(self, symbols: List[str]) -> Dict[str, Tuple[float, Optional[float]]]:
+        """
+        Get the latest close and the previous close (None if unknown) per symbol
+        with one batched download; symbols without data are left out
+        """
+        latest_closes = {}
         
-        current_price = stock.get('current_price', stock['price'])
-        original_price = stock['price']
+        try:
+            data = yf.download(symbols, period="2d", group_by='ticker',
+                               auto_adjust=True, threads=True, progress=False)
+        except Exception as e:
+            return latest_closes
         
-        if original_price == 0:
-            return 0.0
+        for symbol in symbols:
+            try:
+                hist = data[symbol].dropna(subset=['Close'])
+            except Exception as e:
+                # Symbol missing from the download
+                continue
+                
+            if hist.empty:
+                continue
+                
+            # Get current and previous closing prices
+            closes = hist['Close'].to_numpy(dtype=np.float64)
+            current_price = float(closes[-1])
             
-        return ((current_price - original_price) / original_price) * 100
-    
-    def get_daily_change_percentage(self, stock: Dict) -> float:
-        """Calculate daily price change percentage"""
-        current_price = stock.get('current_price', stock['price'])
-        previous_close = stock.get('previous_close')
+            # Get previous day's close if available
+            previous_close = None
+            if len(closes) > 1:
+                previous_close = float(closes[-2])
+            elif 'Open' in hist.columns:
+                previous_close = float(hist['Open'].to_numpy(dtype=np.float64)[-1])
+                
+            latest_closes[symbol] = (current_price, previous_close)
         
-        if previous_close is None or previous_close == 0:
-            return 0.0
-            
-        return ((current_price - previous_close) / previous_close) * 100
+        return latest_closes
     
-    def get_user_daily_change_value(self, stock: Dict, user_percentage: float) -> float:
-        """Calculate daily value change for user's portion"""
-        current_price = stock.get('current_price', stock['price'])
-        previous_close = stock.get('previous_close')
+    def get_portfolio_value(self, stocks: List[Dict]) -> float:
+        """Calculate total portfolio value (of stocks as returned by fetch_stock_prices)"""
+        count = len(stocks)
+        quantities = np.fromiter((stock['quantity'] for stock in stocks), dtype=np.float64, count=count)
+        prices = np.fromiter((stock['current_price'] for stock in stocks), dtype=np.float64, count=count)
+        return float(np.dot(quantities, prices))
+    
+    def get_close_history(self, symbols: List[str], start, end) -> pd.DataFrame:
+        """
+        Get daily closing prices for several symbols with one batched download
+        Returns a frame indexed by (timezone-naive) date with one column per
+        symbol; empty if the download fails
+        """
+        empty = pd.DataFrame(columns=symbols, index=pd.DatetimeIndex([]), dtype=np.float64)
         
-        if previous_close is None:
-            return 0.0
-            
-        daily_change = (current_price - previous_close) * stock['quantity'] * user_percentage
-        return daily_change
+        try:
+            data = yf.download(symbols, start=start, end=end, auto_adjust=True,
+                               threads=True, progress=False)
+        except Exception as e:
+            return empty
+        
+        if data is None or data.empty:
+            return empty
+        
+        closes = data['Close']
+        if isinstance(closes, pd.Series):
+            # Single symbol without a ticker column level
+            closes = closes.to_frame(symbols[0])
+        closes = closes.reindex(columns=symbols)
+        if closes.index.tz is not None:
+            closes.index = closes.index.tz_localize(None)
+        return closes
     
-    def get_historical_data(self, stocks: List[Dict], period: str = '1d') -> List[Dict]:
-        """Get historical data for stocks for the specified period"""
-        period_map = {
-            '1d': '2d',  # Need 2 days to calculate 1-day change
-            '1w': '1wk',
-            '1m': '1mo', 
-            '1y': '1y'
+    def get_historical_data(self, stocks: List[Dict], period: str = '1d',
+                            closes: Optional[pd.DataFrame] = None) -> Dict[str, np.ndarray]:
+        """
+        Get historical data for stocks for the specified period
+        Every period is sliced from one year of daily closes as returned by
+        get_close_history (downloaded if not given), so periods can share a fetch.
+        Returns parallel arrays (one entry per stock) keyed by symbol, name,
+        current_price, previous_price, historical_change and price_source
+        """
+        # Longer periods start after this offset; anything else is a 1-day change
+        period_offsets = {
+            '1w': pd.DateOffset(weeks=1),
+            '1m': pd.DateOffset(months=1),
+            '1y': pd.DateOffset(years=1)
         }
         
-        yf_period = period_map.get(period, '2d')
-        updated_stocks = []
+        count = len(stocks)
+        current_prices = np.array([stock['price'] for stock in stocks], dtype=np.float64)
+        previous_prices = current_prices.copy()
+        historical_changes = np.zeros(count)
+        price_sources = np.full(count, 'default', dtype=object)
         
-        for stock in stocks:
+        if closes is None:
+            non_cash_symbols = [stock['symbol'] for stock in stocks if stock['symbol'] != 'CASH']
+            closes = self.get_close_history(non_cash_symbols, *last_year_range())
+        
+        if period in period_offsets:
+            closes = closes.loc[closes.index > pd.Timestamp.now().normalize() - period_offsets[period]]
+        
+        for i, stock in enumerate(stocks):
             if stock['symbol'] == 'CASH':
-                updated_stock = stock.copy()
-                updated_stock['historical_change'] = 0.0
-                updated_stock['period'] = period
-                updated_stocks.append(updated_stock)
+                price_sources[i] = None
                 continue
                 
             try:
-                ticker = yf.Ticker(stock['symbol'])
-                hist = ticker.history(period=yf_period)
+                # Only this symbol's trading days (the batch aligns all symbols' dates)
+                symbol_closes = closes[stock['symbol']].dropna().to_numpy(dtype=np.float64)
+            except Exception as e:
+                # Symbol missing from the closes, keep the default price and no change
+                continue
+                
+            if len(symbol_closes) >= 2:
+                current_price = float(symbol_closes[-1])
                 
-                if not hist.empty and len(hist) >= 2:
-                    current_price = float(hist['Close'].iloc[-1])
-                    
-                    if period == '1d':
-                        # For 1-day, use previous day's close or today's open
-                        if len(hist) > 1:
-                            previous_price = float(hist['Close'].iloc[-2])
-                        else:
-                            previous_price = float(hist['Open'].iloc[-1])
-                    else:
-                        # For longer periods, use first day's close
-                        previous_price = float(hist['Close'].iloc[0])
-                    
-                    change_percentage = ((current_price - previous_price) / previous_price * 100) if previous_price > 0 else 0
-                    
-                    updated_stock = stock.copy()
-                    updated_stock['current_price'] = current_price
-                    updated_stock['previous_price'] = previous_price
-                    updated_stock['historical_change'] = change_percentage
-                    updated_stock['period'] = period
-                    updated_stock['price_source'] = 'live'
-                    updated_stocks.append(updated_stock)
+                if period in period_offsets:
+                    # For longer periods, use first day's close
+                    previous_price = float(symbol_closes[0])
                 else:
-                    # Fallback to default
-                    updated_stock = stock.copy()
-                    updated_stock['current_price'] = stock['price']
-                    updated_stock['previous_price'] = stock['price']
-                    updated_stock['historical_change'] = 0.0
-                    updated_stock['period'] = period
-                    updated_stock['price_source'] = 'default'
-                    updated_stocks.append(updated_stock)
-                    
-            except Exception as e:
-                # Error fetching data
-                updated_stock = stock.copy()
-                updated_stock['current_price'] = stock['price']
-                updated_stock['previous_price'] = stock['price']
-                updated_stock['historical_change'] = 0.0
-                updated_stock['period'] = period
-                updated_stock['price_source'] = 'default'
-                updated_stocks.append(updated_stock)
-        
-        return updated_stocks
+                    # For 1-day, use previous day's close
+                    previous_price = float(symbol_closes[-2])
+                
+                change_percentage = ((current_price - previous_price) / previous_price * 100) if previous_price > 0 else 0
+                
+                current_prices[i] = current_price
+                previous_prices[i] = previous_price
+                historical_changes[i] = change_percentage
+                price_sources[i] = 'live'
+            # Otherwise keep the default price and no change
+        
+        return {
+            'symbol': np.array([stock['symbol'] for stock in stocks], dtype=object),
+            'name': np.array([stock['name'] for stock in stocks], dtype=object),
+            'current_price': current_prices,
+            'previous_price': previous_prices,
+            'historical_change': historical_changes,
+            'price_source': price_sources
+        }
+
+@st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes, like the prices in app.py
+def cached_latest_closes(_price_fetcher: PriceFetcher, symbols: Tuple[str, ...]) -> Dict[str, Tuple[float, Optional[float]]]:
+    """Latest closes of the given symbols, independent of the display language"""
+    return _price_fetcher.get_latest_closes(list(symbols))
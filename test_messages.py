@@ -2,10 +2,12 @@
 Test script to add sample messages for testing the message system
 """
 
-from message_system import message_system
+from message_system import get_message_system
 
 # Add some test messages (optional - uncomment what you want to test)
 def add_test_messages():
+    message_system = get_message_system()
+    
     # Uncomment to add specific test messages (not recommended for production)
     # message_system.add_one_time_message(
     #     "foehr", 
@@ -2,6 +2,9 @@
 Language translations for the portfolio application
 """
 
+import functools
+from typing import Callable
+
 def get_language(username: str) -> str:
     """Get language preference based on username"""
     german_users = ['juergen', 'kremer']
@@ -43,6 +46,7 @@ TRANSLATIONS = {
         'historical_performance': 'Historical Portfolio Performance',
         'relative_performance': 'Relative Performance (Base = 100)',
         'portfolio_vs_benchmark': 'Portfolio vs URTH Benchmark',
+        'loading_historical_data': 'Loading historical performance...',
         'timeframe': 'Timeframe',
         'granularity': 'Granularity',
         'daily': 'Daily',
@@ -136,6 +140,7 @@ TRANSLATIONS = {
         'historical_performance': 'Historische Portfolio-Performance',
         'relative_performance': 'Relative Performance (Basis = 100)',
         'portfolio_vs_benchmark': 'Portfolio vs URTH Benchmark',
+        'loading_historical_data': 'Lade historische Performance...',
         'timeframe': 'Zeitraum',
         'granularity': 'Granularität',
         'daily': 'Täglich',
@@ -196,19 +201,30 @@ TRANSLATIONS = {
     }
 }
 
+@functools.lru_cache(maxsize=4096)
+def _get_text_cached(key: str, language: str) -> str:
+    """Translated template for the given key and language (translations are static)"""
+    return TRANSLATIONS.get(language, TRANSLATIONS['en']).get(key, key)
+
 def get_text(key: str, language: str = 'en', *args) -> str:
     """Get translated text for the given key and language"""
-    text = TRANSLATIONS.get(language, TRANSLATIONS['en']).get(key, key)
+    text = _get_text_cached(key, language)
     if args:
         return text.format(*args)
     return text
 
+# Bound formatters for the currency templates (same symbol for every language)
+_CURRENCY_FORMAT = '€{:,.2f}'.format
+_CURRENCY_CHANGE_FORMAT = '€{:+,.2f}'.format
+
 def format_currency(amount: float, language: str = 'en') -> str:
     """Format currency amount based on language"""
-    currency_symbol = '€'
-    return f"{currency_symbol}{amount:,.2f}"
+    return _CURRENCY_FORMAT(amount)
+
+def make_currency_formatter(language: str = 'en') -> Callable[[float], str]:
+    """Return a formatter equivalent to format_currency for a fixed language"""
+    return _CURRENCY_FORMAT
 
 def format_currency_change(amount: float, language: str = 'en') -> str:
     """Format currency change amount with proper sign and symbol"""
-    currency_symbol = '€'
-    return f"{currency_symbol}{amount:+,.2f}"
+    return _CURRENCY_CHANGE_FORMAT(amount)